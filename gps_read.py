@@ -1,220 +1,637 @@
 #!/usr/bin/env python3
-import argparse, sys, os, re, time, json, math, datetime
+import argparse, sys, os, re, time, json, math, datetime, functools, operator, queue, threading
+from collections import deque
 import serial
+import serial.threaded
+try:
+    import orjson  # optional: C/SIMD JSON encoder for --json
+except ImportError:
+    orjson = None
 
-NMEA_RE = re.compile(r'^\$([A-Z0-9]{2,3}[A-Z]{3}),(.*)\*([0-9A-F]{2})\r?\n?$')
+# (shift, mask) pairs that fold a little-endian int of up to 128 bytes down to one byte
+_XOR_FOLDS = tuple((w, (1 << w) - 1) for w in (512, 256, 128, 64, 32, 16, 8))
 
-def nmea_checksum(s):
-    c = 0
-    for ch in s:
-        c ^= ord(ch)
-    return f"{c:02X}"
+# unit conversions, hoisted so the per-sentence paths only multiply
+INV_60 = 1.0 / 60.0
+KN2MPS = 0.514444
+MPS2KMH = 3.6
+KMH2MPS = 1.0 / 3.6
+_NEG_HEMI = frozenset((b'S', b'W'))
 
+_HEX_DIGITS = frozenset(b'0123456789ABCDEF')
+
+# keys that make a fix "complete" enough for --once to print it
+ONCE_KEYS = ('lat', 'lon', 'utc_time', 'num_sats', 'hdop')
+# sentence types whose fields[0] is the epoch's time of day; a new value
+# there means the receiver has started reporting the next fix
+_EPOCH_TIME_SENTENCES = frozenset(('RMC', 'GGA', 'GNS', 'GST'))
+
+UTC = datetime.timezone.utc
+# [UTC day number, 'YYYY-MM-DD' of that day]; refreshed when the day rolls over
+_TODAY_CACHE = [None, None]
+
+def nmea_checksum(b):
+    """XOR of all bytes in b (the sentence body between '$' and '*')."""
+    if len(b) > 128:
+        return functools.reduce(operator.xor, b, 0)
+    # XOR the halves of the body as one big int instead of looping per byte
+    n = int.from_bytes(b, 'little')
+    for sh, mask in _XOR_FOLDS:
+        n = (n >> sh) ^ (n & mask)
+    return n
+
+def split_sentence(raw):
+    """Validate a stripped raw line and return (talker_sen, fields), or None if invalid.
+
+    fields stay bytes: float()/int() accept them directly, and only the few
+    text fields kept in the state are decoded by the parsers.
+    """
+    # single pass over the bytes: locate '$', '*' and the first ',', check the XOR
+    if not raw or raw[0] != 0x24:  # '$'
+        return None
+    star = raw.rfind(b'*')
+    comma = raw.find(b',', 1, star)
+    if comma < 0 or len(raw) - star != 3:
+        return None
+    if raw[star+1] not in _HEX_DIGITS or raw[star+2] not in _HEX_DIGITS:
+        return None
+    # talker + sentence type: [A-Z0-9]{2,3}[A-Z]{3}
+    head = raw[1:comma]
+    if not (5 <= len(head) <= 6 and head.isalnum() and head[-3:].isalpha() and head.upper() == head):
+        return None
+    if nmea_checksum(raw[1:star]) != int(raw[star+1:], 16):
+        return None  # bad checksum
+    talker_sen = head.decode('ascii')  # e.g., GNRMC
+    fields = raw[comma+1:star].split(b',')
+    return talker_sen, fields
+
+# RMC, GGA and GNS of the same epoch repeat the same lat/lon fields, so
+# only the first of them pays for the conversion
+@functools.lru_cache(maxsize=32)
 def dm_to_deg(dm, hemi):
     # NMEA lat: ddmm.mmmm, lon: dddmm.mmmm
-    if not dm or dm == '':
+    if not dm:
         return None
     try:
         val = float(dm)
     except ValueError:
         return None
-    deg = int(val // 100)
-    minutes = val - deg * 100
-    dec = deg + minutes / 60.0
-    if hemi in ('S', 'W'):
-        dec = -dec
-    return dec
+    deg = int(val * 0.01)
+    dec = deg + (val - deg * 100.0) * INV_60
+    return -dec if hemi in _NEG_HEMI else dec
 
 def knots_to_mps(kn):
     try:
-        return float(kn) * 0.514444
-    except:
+        return float(kn) * KN2MPS
+    except (ValueError, TypeError):
         return None
 
+# empty fields are the common "missing" case: skip the exception path for them
 def safe_float(x):
+    if not x:
+        return None
     try:
         return float(x)
-    except:
+    except ValueError:
+        return None
+
+def safe_int(x):
+    if not x:
+        return None
+    try:
+        return int(x)
+    except ValueError:
         return None
 
 def parse_time_date(utc_hms, ddmmyy):
+    """Return an ISO-8601 UTC timestamp string ('...Z') for NMEA time/date fields."""
     # utc_hms like 123519.00, ddmmyy like 230394
     if not utc_hms:
         return None
-    hh = int(utc_hms[0:2])
-    mm = int(utc_hms[2:4])
-    ss = int(float(utc_hms[4:]))  # handles fractional seconds
+    # one int parse per packed field; fractional seconds are simply sliced off
+    hh, mmss = divmod(int(utc_hms[0:6]), 10000)
+    mm, ss = divmod(mmss, 100)
     if ddmmyy and len(ddmmyy) == 6:
-        d = int(ddmmyy[0:2])
-        mo = int(ddmmyy[2:4])
-        y = 2000 + int(ddmmyy[4:6]) if int(ddmmyy[4:6]) < 80 else 1900 + int(ddmmyy[4:6])
-        return datetime.datetime(y, mo, d, hh, mm, ss, tzinfo=datetime.timezone.utc)
+        d, moyy = divmod(int(ddmmyy), 10000)
+        mo, yy = divmod(moyy, 100)
+        y = 2000 + yy if yy < 80 else 1900 + yy
+        return f"{y:04d}-{mo:02d}-{d:02d}T{hh:02d}:{mm:02d}:{ss:02d}Z"
     # If no date, use today with UTC
-    now = datetime.datetime.now(datetime.timezone.utc)
-    return now.replace(hour=hh, minute=mm, second=ss, microsecond=0)
-
-def parse_sentence(talker_sen, fields):
-    """Return updates dict extracted from a sentence."""
-    tp = talker_sen[-3:]  # e.g., RMC, GGA...
-    talker = talker_sen[:-3]  # GN, GP, GA, etc.
-    u = {}
-    if tp == 'RMC':
-        # 0 time,1 status,2 lat,3 N/S,4 lon,5 E/W,6 sog,7 cog,8 date,9 mv,10 mvE/W, 11 mode (NMEA 2.3+)
-        if len(fields) >= 11:
-            t = parse_time_date(fields[0], fields[8])
-            if t: u['utc_time'] = t.isoformat().replace('+00:00','Z')
-            u['fix_ok'] = (fields[1] == 'A')
-            lat = dm_to_deg(fields[2], fields[3]); lon = dm_to_deg(fields[4], fields[5])
-            if lat is not None: u['lat'] = lat
-            if lon is not None: u['lon'] = lon
-            sog_mps = knots_to_mps(fields[6]) if fields[6] else None
-            if sog_mps is not None:
-                u['speed_mps'] = sog_mps
-                u['speed_kmh'] = sog_mps * 3.6
-            u['course_deg'] = safe_float(fields[7])
-            # mode indicator may hint GNSS quality: N,A,D,E,R,F
-            if len(fields) >= 12 and fields[11]:
-                u['mode'] = fields[11]
-    elif tp == 'GGA':
-        # 0 time,1 lat,2 N/S,3 lon,4 E/W,5 fixq,6 numsats,7 hdop,8 alt(m),9 M,10 geoid,11 M,12 age,13 dgpsid
-        if len(fields) >= 12:
-            t = parse_time_date(fields[0], None)
-            if t: u['utc_time'] = t.isoformat().replace('+00:00','Z')
-            lat = dm_to_deg(fields[1], fields[2]); lon = dm_to_deg(fields[3], fields[4])
-            if lat is not None: u['lat'] = lat
-            if lon is not None: u['lon'] = lon
-            u['fix_quality'] = int(fields[5]) if fields[5].isdigit() else None  # 0 no fix,1 GPS,2 DGPS,4 RTK fix,5 RTK float
-            u['num_sats'] = int(fields[6]) if fields[6].isdigit() else None
-            u['hdop'] = safe_float(fields[7])
-            u['alt_m'] = safe_float(fields[8])
-            u['geoid_sep_m'] = safe_float(fields[10]) if len(fields) > 10 else None
-            u['age_corrections_s'] = safe_float(fields[12]) if len(fields) > 12 else None
-            u['dgps_id'] = fields[13] if len(fields) > 13 else None
-    elif tp == 'GNS':
-        # 0 time,1 lat,2 N/S,3 lon,4 E/W,5 mode chars,6 numsats,7 hdop,8 alt,9 sep,10 age,11 stn
-        if len(fields) >= 9:
-            t = parse_time_date(fields[0], None)
-            if t: u['utc_time'] = t.isoformat().replace('+00:00','Z')
-            lat = dm_to_deg(fields[1], fields[2]); lon = dm_to_deg(fields[3], fields[4])
-            if lat is not None: u['lat'] = lat
-            if lon is not None: u['lon'] = lon
-            u['mode'] = fields[5]
-            u['num_sats'] = int(fields[6]) if fields[6].isdigit() else None
-            u['hdop'] = safe_float(fields[7])
-            u['alt_m'] = safe_float(fields[8])
-            if len(fields) > 9: u['geoid_sep_m'] = safe_float(fields[9])
-    elif tp == 'GSA':
-        # 0 op mode,1 fix type,2-13 sv ids,14 pdop,15 hdop,16 vdop,17 sysid (v4.10)
-        if len(fields) >= 17:
-            u['fix_type'] = int(fields[1]) if fields[1].isdigit() else None  # 1 no fix,2 2D,3 3D
-            u['pdop'] = safe_float(fields[14])
-            u['hdop'] = safe_float(fields[15])
-            u['vdop'] = safe_float(fields[16])
-    elif tp == 'GSV':
-        # satellites in view; we will tally per-talkers
-        # 0 total_msgs,1 msg_num,2 total_sats, then per-sat: id, elev, az, snr
-        if len(fields) >= 3:
-            total_sats = int(fields[2]) if fields[2].isdigit() else None
-            if total_sats is not None:
-                u.setdefault('gsv', {})
-                # Normalize talker GN/GP/GA/GQ etc
-                u['gsv'][talker] = {'in_view': total_sats}
-    elif tp == 'VTG':
-        # 0 course true,1 T,2 course mag,3 M,4 spd knots,5 N,6 spd kmh,7 K, 8 mode
-        if len(fields) >= 7:
-            u['course_deg'] = safe_float(fields[0])
-            if fields[4]:
-                mps = knots_to_mps(fields[4])
-                if mps is not None:
-                    u['speed_mps'] = mps
-                    u['speed_kmh'] = mps * 3.6
-            elif fields[6]:
-                kmh = safe_float(fields[6])
-                if kmh is not None:
-                    u['speed_kmh'] = kmh
-                    u['speed_mps'] = kmh / 3.6
-            if len(fields) >= 9 and fields[8]:
-                u['mode'] = fields[8]
-    elif tp == 'GST':
-        # pseudorange noise stats: we surface rms and lat/lon/alt std dev if present
-        # 0 time,1 rms,2-4 std lat lon alt,5-7 corr coef
-        if len(fields) >= 5:
-            if fields[0]:
-                t = parse_time_date(fields[0], None)
-                if t: u['utc_time'] = t.isoformat().replace('+00:00','Z')
-            u['rms_range_err_m'] = safe_float(fields[1])
-            u['sd_lat_m'] = safe_float(fields[2])
-            u['sd_lon_m'] = safe_float(fields[3])
-            u['sd_alt_m'] = safe_float(fields[4])
-    return u
-
-def merge_updates(state, updates):
-    for k, v in updates.items():
-        if k == 'gsv':
-            # merge per-talker dict
-            gsv = state.setdefault('gsv', {})
-            for sys, obj in v.items():
-                gsv[sys] = obj
-        else:
-            state[k] = v
-    state['last_update'] = time.time()
-    return state
+    day = int(time.time() // 86400)
+    if day != _TODAY_CACHE[0]:
+        # date from the same clock read as the key, so the two can't disagree at midnight
+        _TODAY_CACHE[:] = [day, datetime.datetime.fromtimestamp(day * 86400, UTC).date().isoformat()]
+    return f"{_TODAY_CACHE[1]}T{hh:02d}:{mm:02d}:{ss:02d}Z"
+
+_UNSET = object()
+
+class GnssState:
+    """Latest receiver values, updated in place by the sentence parsers.
+
+    A field no sentence has reported yet stays unset, so get() returns the
+    default and items() skips it (as --json and --format always did).
+    """
+    __slots__ = (
+        'utc_time', 'lat', 'lon', 'alt_m',
+        'fix_ok', 'fix_quality', 'fix_type', 'mode',
+        'num_sats', 'gsv',
+        'hdop', 'vdop', 'pdop',
+        'speed_mps', 'speed_kmh', 'course_deg',
+        'geoid_sep_m', 'age_corrections_s', 'dgps_id',
+        'rms_range_err_m', 'sd_lat_m', 'sd_lon_m', 'sd_alt_m',
+        'last_update',
+    )
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def items(self):
+        """Yield (name, value) for the reported fields, in __slots__ order."""
+        for k in self.__slots__:
+            v = getattr(self, k, _UNSET)
+            if v is not _UNSET:
+                yield k, v
+
+# Each _parse_xxx applies one sentence to the state and returns True if it
+# carried any updates (False when the sentence is too short to use).
+
+def _parse_rmc(fields, talker, state):
+    # 0 time,1 status,2 lat,3 N/S,4 lon,5 E/W,6 sog,7 cog,8 date,9 mv,10 mvE/W, 11 mode (NMEA 2.3+)
+    if len(fields) < 11:
+        return False
+    t = parse_time_date(fields[0], fields[8])
+    if t: state.utc_time = t
+    state.fix_ok = (fields[1] == b'A')
+    lat = dm_to_deg(fields[2], fields[3]); lon = dm_to_deg(fields[4], fields[5])
+    if lat is not None: state.lat = lat
+    if lon is not None: state.lon = lon
+    sog_mps = knots_to_mps(fields[6]) if fields[6] else None
+    if sog_mps is not None:
+        state.speed_mps = sog_mps
+        state.speed_kmh = sog_mps * MPS2KMH
+    state.course_deg = safe_float(fields[7])
+    # mode indicator may hint GNSS quality: N,A,D,E,R,F
+    if len(fields) >= 12 and fields[11]:
+        state.mode = fields[11].decode('ascii', errors='ignore')
+    return True
+
+def _parse_gga(fields, talker, state):
+    # 0 time,1 lat,2 N/S,3 lon,4 E/W,5 fixq,6 numsats,7 hdop,8 alt(m),9 M,10 geoid,11 M,12 age,13 dgpsid
+    if len(fields) < 12:
+        return False
+    t = parse_time_date(fields[0], None)
+    if t: state.utc_time = t
+    lat = dm_to_deg(fields[1], fields[2]); lon = dm_to_deg(fields[3], fields[4])
+    if lat is not None: state.lat = lat
+    if lon is not None: state.lon = lon
+    state.fix_quality = safe_int(fields[5])  # 0 no fix,1 GPS,2 DGPS,4 RTK fix,5 RTK float
+    state.num_sats = safe_int(fields[6])
+    state.hdop = safe_float(fields[7])
+    state.alt_m = safe_float(fields[8])
+    state.geoid_sep_m = safe_float(fields[10]) if len(fields) > 10 else None
+    state.age_corrections_s = safe_float(fields[12]) if len(fields) > 12 else None
+    state.dgps_id = fields[13].decode('ascii', errors='ignore') if len(fields) > 13 else None
+    return True
+
+def _parse_gns(fields, talker, state):
+    # 0 time,1 lat,2 N/S,3 lon,4 E/W,5 mode chars,6 numsats,7 hdop,8 alt,9 sep,10 age,11 stn
+    if len(fields) < 9:
+        return False
+    t = parse_time_date(fields[0], None)
+    if t: state.utc_time = t
+    lat = dm_to_deg(fields[1], fields[2]); lon = dm_to_deg(fields[3], fields[4])
+    if lat is not None: state.lat = lat
+    if lon is not None: state.lon = lon
+    state.mode = fields[5].decode('ascii', errors='ignore')
+    state.num_sats = safe_int(fields[6])
+    state.hdop = safe_float(fields[7])
+    state.alt_m = safe_float(fields[8])
+    if len(fields) > 9: state.geoid_sep_m = safe_float(fields[9])
+    return True
+
+def _parse_gsa(fields, talker, state):
+    # 0 op mode,1 fix type,2-13 sv ids,14 pdop,15 hdop,16 vdop,17 sysid (v4.10)
+    if len(fields) < 17:
+        return False
+    state.fix_type = safe_int(fields[1])  # 1 no fix,2 2D,3 3D
+    state.pdop = safe_float(fields[14])
+    state.hdop = safe_float(fields[15])
+    state.vdop = safe_float(fields[16])
+    return True
+
+def _parse_gsv(fields, talker, state):
+    # satellites in view; we will tally per-talkers
+    # 0 total_msgs,1 msg_num,2 total_sats, then per-sat: id, elev, az, snr
+    if len(fields) < 3:
+        return False
+    total_sats = safe_int(fields[2])
+    if total_sats is None:
+        return False
+    gsv = state.get('gsv')
+    if gsv is None:
+        gsv = state.gsv = {}
+    # Normalize talker GN/GP/GA/GQ etc
+    gsv[talker] = {'in_view': total_sats}
+    return True
+
+def _parse_vtg(fields, talker, state):
+    # 0 course true,1 T,2 course mag,3 M,4 spd knots,5 N,6 spd kmh,7 K, 8 mode
+    if len(fields) < 7:
+        return False
+    state.course_deg = safe_float(fields[0])
+    if fields[4]:
+        mps = knots_to_mps(fields[4])
+        if mps is not None:
+            state.speed_mps = mps
+            state.speed_kmh = mps * MPS2KMH
+    elif fields[6]:
+        kmh = safe_float(fields[6])
+        if kmh is not None:
+            state.speed_kmh = kmh
+            state.speed_mps = kmh * KMH2MPS
+    if len(fields) >= 9 and fields[8]:
+        state.mode = fields[8].decode('ascii', errors='ignore')
+    return True
+
+def _parse_gst(fields, talker, state):
+    # pseudorange noise stats: we surface rms and lat/lon/alt std dev if present
+    # 0 time,1 rms,2-4 std lat lon alt,5-7 corr coef
+    if len(fields) < 5:
+        return False
+    if fields[0]:
+        t = parse_time_date(fields[0], None)
+        if t: state.utc_time = t
+    state.rms_range_err_m = safe_float(fields[1])
+    state.sd_lat_m = safe_float(fields[2])
+    state.sd_lon_m = safe_float(fields[3])
+    state.sd_alt_m = safe_float(fields[4])
+    return True
+
+_DISPATCH = {
+    'RMC': _parse_rmc,
+    'GGA': _parse_gga,
+    'GNS': _parse_gns,
+    'GSA': _parse_gsa,
+    'GSV': _parse_gsv,
+    'VTG': _parse_vtg,
+    'GST': _parse_gst,
+}
+
+def parse_sentence(talker_sen, fields, state):
+    """Apply a sentence to state in place; return True if it carried any updates."""
+    # talker_sen e.g. GNRMC: sentence type RMC, GGA..., talker GN, GP, GA, etc.
+    fn = _DISPATCH.get(talker_sen[-3:])
+    if fn and fn(fields, talker_sen[:-3], state):
+        state.last_update = time.time()
+        return True
+    return False
+
+# GGA fix quality and GSA fix type labels for the human-readable status
+_QMAP = {0:'no-fix',1:'GPS',2:'DGPS',4:'RTK-fix',5:'RTK-float',6:'est'}
+_FIXTYPE_MAP = {1:'no-fix',2:'2D',3:'3D'}
 
 def human_status(state):
-    def fmt(v, nd=6):
-        return f"{v:.{nd}f}" if isinstance(v, float) and not math.isnan(v) else str(v)
-    parts = []
-    t = state.get('utc_time')
-    parts.append(f"UTC {t}" if t else "UTC ?")
-    fxq = state.get('fix_quality')
-    fxt = state.get('fix_type')
+    get = state.get
+    t = get('utc_time')
+    fxq = get('fix_quality'); fxt = get('fix_type')
+    lat = get('lat'); lon = get('lon'); alt = get('alt_m')
+    sats = get('num_sats')
+    hdop = get('hdop'); pdop = get('pdop'); vdop = get('vdop')
+    kmh = get('speed_kmh'); cog = get('course_deg')
+    gsv = get('gsv')
+    # all numeric fields below come from float(), so format them directly
+    parts = [f"UTC {t}" if t else "UTC ?"]
     fix_txt = None
     if fxq is not None:
-        qmap = {0:'no-fix',1:'GPS',2:'DGPS',4:'RTK-fix',5:'RTK-float',6:'est'}
-        fix_txt = qmap.get(fxq, str(fxq))
+        fix_txt = _QMAP.get(fxq, str(fxq))
     elif fxt is not None:
-        fix_txt = {1:'no-fix',2:'2D',3:'3D'}.get(fxt, str(fxt))
+        fix_txt = _FIXTYPE_MAP.get(fxt, str(fxt))
     if fix_txt:
         parts.append(f"fix {fix_txt}")
-    if state.get('lat') is not None and state.get('lon') is not None:
-        parts.append(f"lat {fmt(state['lat'],6)} lon {fmt(state['lon'],6)}")
-    if state.get('alt_m') is not None:
-        parts.append(f"alt {fmt(state['alt_m'],1)} m")
-    if state.get('num_sats') is not None:
-        parts.append(f"sats {state['num_sats']}")
-    if state.get('hdop') is not None:
-        parts.append(f"HDOP {fmt(state['hdop'],1)}")
-    if state.get('pdop') is not None:
-        parts.append(f"PDOP {fmt(state['pdop'],1)}")
-    if state.get('vdop') is not None:
-        parts.append(f"VDOP {fmt(state['vdop'],1)}")
-    if state.get('speed_kmh') is not None:
-        parts.append(f"spd {fmt(state['speed_kmh'],1)} kmh")
-    if state.get('course_deg') is not None:
-        parts.append(f"cog {fmt(state['course_deg'],1)} deg")
+    if lat is not None and lon is not None:
+        parts.append(f"lat {lat:.6f} lon {lon:.6f}")
+    if alt is not None:
+        parts.append(f"alt {alt:.1f} m")
+    if sats is not None:
+        parts.append(f"sats {sats}")
+    if hdop is not None:
+        parts.append(f"HDOP {hdop:.1f}")
+    if pdop is not None:
+        parts.append(f"PDOP {pdop:.1f}")
+    if vdop is not None:
+        parts.append(f"VDOP {vdop:.1f}")
+    if kmh is not None:
+        parts.append(f"spd {kmh:.1f} kmh")
+    if cog is not None:
+        parts.append(f"cog {cog:.1f} deg")
     # GSV systems summary
-    gsv = state.get('gsv') or {}
     if gsv:
         sys_s = ",".join(f"{sys}:{gsv[sys].get('in_view','?')}" for sys in sorted(gsv.keys()))
         parts.append(f"in_view[{sys_s}]")
     return " | ".join(parts)
 
+# one %-conversion with a mapping key, e.g. %(lat).6f, or a literal %%
+_FORMAT_SPEC_RE = re.compile(r'%(?:%|\(([^)]*)\)([#0 +-]*\d*(?:\.\d*)?[hlL]?[diouxXeEfFgGcrsa]))')
+
+def compile_format(fmt):
+    """Turn a --format string into a function of a GnssState.
+
+    The string is tokenized once, so each emit only reads the referenced
+    slots instead of re-parsing the string against a copy of the state.
+    Errors are those of plain `fmt % state`: KeyError, ValueError or TypeError.
+    """
+    def emit_dict(state):
+        # fallback for strings the tokenizer doesn't handle (e.g., positional %s)
+        return fmt % {k: (str(v) if k == 'gsv' else v) for k, v in state.items()}
+
+    slots = frozenset(GnssState.__slots__)
+
+    # (literal text before the conversion, key, single-conversion format)
+    tokens = []
+    lit = ''
+    pos = 0
+    for m in _FORMAT_SPEC_RE.finditer(fmt):
+        text = fmt[pos:m.start()]
+        if '%' in text:
+            return emit_dict
+        lit += text
+        pos = m.end()
+        if m.group(1) is None:
+            lit += '%'
+        elif '(' in m.group(1):
+            return emit_dict  # nested parentheses in a key: let % parse it
+        else:
+            k = m.group(1)
+            tokens.append((lit, k, k in slots, '%' + m.group(2)))
+            lit = ''
+    if '%' in fmt[pos:]:
+        return emit_dict
+    tail = lit + fmt[pos:]
+
+    def emit(state):
+        out = []
+        for lit, k, known, spec in tokens:
+            v = getattr(state, k, _UNSET) if known else _UNSET
+            if v is _UNSET:
+                raise KeyError(k)  # not reported yet, or not a field at all
+            out.append(lit)
+            # GSV dict is rendered via its string representation
+            out.append(spec % (str(v) if k == 'gsv' else v,))
+        out.append(tail)
+        return ''.join(out)
+    return emit
+
+def make_emitter(args):
+    """Return a function writing one status line per --format, --json or the human-readable default.
+
+    The function returns True if it wrote a line, False if --format failed.
+    """
+    # bound methods, one write per part and a single flush per line
+    w = sys.stdout.write
+    flush = sys.stdout.flush
+
+    def write_line(line):
+        w(line)
+        w('\n')
+        flush()
+
+    if args.format:
+        fmt = compile_format(args.format)
+        def emit(state):
+            try:
+                line = fmt(state)
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"Format error: {e}", file=sys.stderr)
+                return False
+            write_line(line)
+            return True
+        return emit
+    if args.json:
+        def to_json(state):
+            # one pass: reduce float verbosity and flatten gsv to {"GP": 7, "GL": 8};
+            # NaN/Infinity become null, as orjson writes them, so both encoders agree
+            return {k: ((round(v, 6 if k in ('lat','lon') else 3) if math.isfinite(v) else None)
+                        if isinstance(v, float)
+                        else {sys: data.get('in_view', 0) for sys, data in v.items()} if k == 'gsv'
+                        else v)
+                    for k, v in state.items()}
+        out = getattr(sys.stdout, 'buffer', None)
+        if orjson and out is not None:
+            # orjson produces UTF-8 bytes: skip the text layer altogether
+            bw = out.write
+            bflush = out.flush
+            def emit(state):
+                data = orjson.dumps(to_json(state))
+                flush()  # keep ordering with anything pending in the text layer (--raw)
+                bw(data)
+                bw(b'\n')
+                bflush()
+                return True
+            return emit
+        def emit(state):
+            write_line(json.dumps(to_json(state), separators=(',',':'), ensure_ascii=False))
+            return True
+        return emit
+    def emit(state):
+        write_line(human_status(state))
+        return True
+    return emit
+
 class SerialReader:
     def __init__(self, port, baud):
         self.port = port
         self.baud = baud
         self.ser = None
+        self.thread = None
 
     def open(self):
-        self.ser = serial.Serial(self.port, self.baud, timeout=0)
+        # blocking reads: wake up as soon as bytes arrive instead of polling
+        self.ser = serial.Serial(self.port, self.baud, timeout=None)
 
-    def readlines(self):
+    def start(self, protocol):
+        """Run pyserial's reader thread, feeding received chunks to protocol."""
+        self.thread = serial.threaded.ReaderThread(self.ser, lambda: protocol)
+        self.thread.start()
+
+class NMEAProtocol(serial.threaded.Protocol):
+    """Split serial chunks into lines and hand them to the main thread via a bounded queue.
+
+    ReaderThread drains the OS buffer in chunks (read(in_waiting or 1)) off
+    the main thread; if parsing or output stall, the oldest queued lines are
+    dropped instead of letting the UART buffer overflow.
+    """
+    def __init__(self, maxsize=256):
+        self.q = queue.Queue(maxsize=maxsize)
+        self.buffer = bytearray()
+        self.lost = False
+        self.error = None
+
+    def data_received(self, data):
+        buf = self.buffer
+        buf += data
+        end = buf.rfind(b'\n')
+        if end < 0:
+            return
+        lines = buf[:end].split(b'\n')
+        del buf[:end+1]
+        q = self.q
+        for line in lines:
+            line = bytes(line)
+            while True:
+                try:
+                    q.put_nowait(line)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()  # drop the oldest line
+                    except queue.Empty:
+                        pass
+
+    def connection_lost(self, exc):
+        # keep the error for lines() instead of raising it in the reader thread
+        self.error = exc
+        self.lost = True
+
+    def lines(self):
+        """Yield received lines (without the trailing newline) as bytes."""
+        q = self.q
         while True:
-            line = self.ser.readline()  #type: ignore
-            if not line:
-                time.sleep(0.02)
+            try:
+                first = q.get(timeout=1.0)
+            except queue.Empty:
+                if self.lost:
+                    # reader died (e.g., device unplugged): surface its error
+                    if self.error:
+                        raise self.error
+                    return
                 continue
-            yield line
+            # then drain the backlog without the timed wait of get(timeout=...)
+            batch = [first]
+            while True:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            yield from batch
+
+class LogWriter(threading.Thread):
+    """Append raw lines to a file from a background thread.
+
+    Lines go into a bounded ring buffer and are written out in one batch
+    every `interval` seconds, so the parse loop never blocks on disk I/O.
+    """
+    def __init__(self, path, interval=0.25, maxlen=4096):
+        super().__init__(daemon=True)
+        self.f = open(path, "ab", buffering=1 << 16)
+        self.buf = deque(maxlen=maxlen)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def write(self, line):
+        self.buf.append(line)
+
+    def flush(self):
+        buf = self.buf
+        lines = [buf.popleft() for _ in range(len(buf))]
+        if lines:
+            self.f.write(b"\n".join(lines) + b"\n")
+            self.f.flush()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def close(self):
+        self.stopped.set()
+        self.join()
+        self.flush()
+        self.f.close()
+
+class OnceWatcher:
+    """Decide when --once prints: at the end of the first epoch with a complete fix.
+
+    observe() sees each sentence before it is echoed, logged or parsed, and
+    returns True when the state built from the earlier sentences should be
+    printed now.  Attempts are at most one per second, so a --format error
+    (e.g., a key not reported yet) is retried on a later epoch.
+    """
+    def __init__(self):
+        self.epoch_time = None
+        self.epoch_advanced = False
+        self.last_tick = 0
+        self.fix_ticks = 0
+        self.last_try = 0
+
+    def observe(self, talker_sen, fields, state, now):
+        complete = all(state.get(k) is not None for k in ONCE_KEYS)
+        ready = False
+        if talker_sen[-3:] in _EPOCH_TIME_SENTENCES and fields[0]:
+            # a new time of day means the previous epoch is over
+            new_epoch = self.epoch_time is not None and fields[0] != self.epoch_time
+            self.epoch_time = fields[0]
+            self.epoch_advanced = self.epoch_advanced or new_epoch
+            ready = new_epoch and complete
+        has_fix = state.get('lat') is not None and state.get('lon') is not None and state.get('utc_time')
+        if has_fix and now - self.last_tick >= 1.0:
+            # fallback when the above can't fire (ONCE_KEYS never all reported, or the
+            # time never advances): like the old --once, settle for a position fix
+            # seen on two 1s ticks
+            self.last_tick = now
+            self.fix_ticks += 1
+            ready = ready or (self.fix_ticks >= 2 and (not complete or not self.epoch_advanced))
+        if not ready or now - self.last_try < 1.0:
+            return False
+        self.last_try = now
+        return True
+
+HELP_FORMAT = """\
+Available format keys for use with --format:
+
+Time and Position:
+  %(utc_time)s      - ISO-8601 UTC timestamp (e.g., '2025-10-29T12:34:56Z')
+  %(lat).6f         - Latitude in decimal degrees
+  %(lon).6f         - Longitude in decimal degrees
+  %(alt_m).1f       - Altitude in meters above MSL
+
+Fix Quality and Status:
+  %(fix_ok)s        - Boolean indicating valid position fix
+  %(fix_quality)d   - GGA fix quality (0=no fix, 1=GPS, 2=DGPS, 4=RTK-fix, 5=RTK-float)
+  %(fix_type)d      - GSA fix dimension (1=no fix, 2=2D, 3=3D)
+  %(mode)s          - NMEA positioning mode (N/A/D/E/R/F)
+
+Satellite Information:
+  %(num_sats)d      - Number of satellites used in solution
+  %(gsv)s           - Satellites in view per constellation (dict)
+
+Dilution of Precision:
+  %(hdop).2f        - Horizontal dilution of precision
+  %(vdop).2f        - Vertical dilution of precision
+  %(pdop).2f        - Position dilution of precision
+
+Motion:
+  %(speed_mps).2f   - Ground speed in meters per second
+  %(speed_kmh).2f   - Ground speed in kilometers per hour
+  %(course_deg).1f  - Course over ground in degrees (0-360)
+
+Differential Corrections:
+  %(geoid_sep_m).1f - Geoid separation in meters
+  %(age_corrections_s)s - Age of differential corrections in seconds
+  %(dgps_id)s       - Differential reference station ID
+
+Error Estimates:
+  %(rms_range_err_m).2f - RMS of pseudorange residuals in meters
+  %(sd_lat_m).2f    - Standard deviation of latitude error in meters
+  %(sd_lon_m).2f    - Standard deviation of longitude error in meters
+  %(sd_alt_m).2f    - Standard deviation of altitude error in meters
+
+Metadata:
+  %(last_update).3f - Local timestamp when record was emitted
+
+Example format strings:
+  --format 'Lat: %(lat).6f, Lon: %(lon).6f'
+  --format '%(utc_time)s | %(lat).6f,%(lon).6f | Alt: %(alt_m).1fm | Sats: %(num_sats)d'
+  --format 'Speed: %(speed_kmh).1f km/h | Course: %(course_deg).0f°'
+"""
 
 def main():
     ap = argparse.ArgumentParser(description="Read and interpret NMEA from a Navisys GR-M02 or similar GNSS")
@@ -223,50 +640,14 @@ def main():
     ap.add_argument("-j", "--json", action="store_true", help="emit compact JSON status lines once per second")
     ap.add_argument("-r", "--raw", action="store_true", help="echo valid NMEA sentences")
     ap.add_argument("-l", "--log", default=None, help="path to append raw NMEA")
-    ap.add_argument("-o", "--once", action="store_true", help="exit after first valid fix summary")
+    ap.add_argument("-o", "--once", action="store_true", help="exit after printing the first complete fix (a full epoch with position, time, satellites and HDOP)")
     ap.add_argument("-f", "--format", default=None, help="custom format string using %% formatting (%%(utc_time)s|lat: %%(lat).6f')")
     ap.add_argument("-P", "--partial", action="store_true", help="allow partial outputs without lat/lon/utc_time")
     ap.add_argument("--help-format", action="store_true", help="show available format keys and exit")
     args = ap.parse_args()
 
     if args.help_format:
-        print("Available format keys for use with --format:")
-        print("\nTime and Position:")
-        print("  %(utc_time)s      - ISO-8601 UTC timestamp (e.g., '2025-10-29T12:34:56Z')")
-        print("  %(lat).6f         - Latitude in decimal degrees")
-        print("  %(lon).6f         - Longitude in decimal degrees")
-        print("  %(alt_m).1f       - Altitude in meters above MSL")
-        print("\nFix Quality and Status:")
-        print("  %(fix_ok)s        - Boolean indicating valid position fix")
-        print("  %(fix_quality)d   - GGA fix quality (0=no fix, 1=GPS, 2=DGPS, 4=RTK-fix, 5=RTK-float)")
-        print("  %(fix_type)d      - GSA fix dimension (1=no fix, 2=2D, 3=3D)")
-        print("  %(mode)s          - NMEA positioning mode (N/A/D/E/R/F)")
-        print("\nSatellite Information:")
-        print("  %(num_sats)d      - Number of satellites used in solution")
-        print("  %(gsv)s           - Satellites in view per constellation (dict)")
-        print("\nDilution of Precision:")
-        print("  %(hdop).2f        - Horizontal dilution of precision")
-        print("  %(vdop).2f        - Vertical dilution of precision")
-        print("  %(pdop).2f        - Position dilution of precision")
-        print("\nMotion:")
-        print("  %(speed_mps).2f   - Ground speed in meters per second")
-        print("  %(speed_kmh).2f   - Ground speed in kilometers per hour")
-        print("  %(course_deg).1f  - Course over ground in degrees (0-360)")
-        print("\nDifferential Corrections:")
-        print("  %(geoid_sep_m).1f - Geoid separation in meters")
-        print("  %(age_corrections_s)s - Age of differential corrections in seconds")
-        print("  %(dgps_id)s       - Differential reference station ID")
-        print("\nError Estimates:")
-        print("  %(rms_range_err_m).2f - RMS of pseudorange residuals in meters")
-        print("  %(sd_lat_m).2f    - Standard deviation of latitude error in meters")
-        print("  %(sd_lon_m).2f    - Standard deviation of longitude error in meters")
-        print("  %(sd_alt_m).2f    - Standard deviation of altitude error in meters")
-        print("\nMetadata:")
-        print("  %(last_update).3f - Local timestamp when record was emitted")
-        print("\nExample format strings:")
-        print("  --format 'Lat: %(lat).6f, Lon: %(lon).6f'")
-        print("  --format '%(utc_time)s | %(lat).6f,%(lon).6f | Alt: %(alt_m).1fm | Sats: %(num_sats)d'")
-        print("  --format 'Speed: %(speed_kmh).1f km/h | Course: %(course_deg).0f°'")
+        print(HELP_FORMAT, end="")
         sys.exit(0)
 
     rdr = SerialReader(args.port, args.baud)
@@ -275,153 +656,48 @@ def main():
     except Exception as e:
         print(f"Failed to open {args.port} at {args.baud}: {e}", file=sys.stderr)
         sys.exit(1)
+    nmea = NMEAProtocol()
+    rdr.start(nmea)
 
-    state = {}
+    emit = make_emitter(args)
+    w = sys.stdout.write
+    state = GnssState()
     last_emit = 0
+    once = OnceWatcher() if args.once else None
     logf = None
     if args.log:
-        logf = open(args.log, "a", buffering=1)
+        logf = LogWriter(args.log)
+        logf.start()
 
-    # Special handling for --once: collect two outputs and print the longer one (avoids partial data)
-    if args.once:
-        outputs = []
-        for raw in rdr.readlines():
-            try:
-                s = raw.decode('ascii', errors='ignore').strip()
-            except:
-                continue
-            if not s.startswith('$'):
-                continue
-            m = NMEA_RE.match(s)
-            if not m:
+    try:
+        for raw in nmea.lines():
+            raw = raw.strip()
+            sen = split_sentence(raw)
+            if not sen:
                 continue
-            body = m.group(1) + ',' + m.group(2)
-            cs = m.group(3).upper()
-            calc = nmea_checksum(body)
-            if cs != calc:
-                continue  # bad checksum
-            talker_sen = m.group(1)  # e.g., GNRMC
-            fields = m.group(2).split(',')
-
-            if args.raw:
-                print(s)
-            if logf:
-                logf.write(s + "\n")
-
-            updates = parse_sentence(talker_sen, fields)
-            if updates:
-                merge_updates(state, updates)
+            talker_sen, fields = sen
 
             now = time.time()
-            if now - last_emit >= 1.0:
-                last_emit = now
-                if state.get('lat') is not None and state.get('lon') is not None and state.get('utc_time'):
-                    # Generate output
-                    if args.format:
-                        try:
-                            format_dict = {}
-                            for k, v in state.items():
-                                if k == 'gsv':
-                                    format_dict[k] = str(v)
-                                elif isinstance(v, float):
-                                    format_dict[k] = v
-                                else:
-                                    format_dict[k] = v
-                            output = args.format % format_dict
-                            outputs.append(output)
-                        except (KeyError, ValueError, TypeError) as e:
-                            print(f"Format error: {e}", file=sys.stderr)
-                    elif args.json:
-                        out = dict(state)  # shallow copy
-                        # reduce float verbosity and format gsv for readability
-                        for k in list(out.keys()):
-                            v = out[k]
-                            if k == 'gsv':
-                                # Flatten gsv to just {"GP": 7, "GL": 8} format
-                                out[k] = {sys: data.get('in_view', 0) for sys, data in v.items()}
-                            elif isinstance(v, float):
-                                out[k] = round(v, 6 if k in ('lat','lon') else 3)
-                        output = json.dumps(out, separators=(',',':'), ensure_ascii=False)
-                        outputs.append(output)
-                    else:
-                        output = human_status(state)
-                        outputs.append(output)
-
-                    # Exit after collecting two outputs
-                    if len(outputs) >= 2:
-                        break
-
-        # Print the longer of the two outputs
-        if outputs:
-            longer = max(outputs, key=len)
-            print(longer, flush=True)
-        if logf:
-            logf.close()
-        return
-
-    try:
-        for raw in rdr.readlines():
-            try:
-                s = raw.decode('ascii', errors='ignore').strip()
-            except:
-                continue
-            if not s.startswith('$'):
-                continue
-            m = NMEA_RE.match(s)
-            if not m:
-                continue
-            body = m.group(1) + ',' + m.group(2)
-            cs = m.group(3).upper()
-            calc = nmea_checksum(body)
-            if cs != calc:
-                continue  # bad checksum
-            talker_sen = m.group(1)  # e.g., GNRMC
-            fields = m.group(2).split(',')
+            # print before this sentence is echoed, logged or parsed,
+            # so --once stops cleanly at the epoch boundary
+            if once and once.observe(talker_sen, fields, state, now) and emit(state):
+                break
 
             if args.raw:
-                print(s)
+                w(raw.decode('ascii', errors='ignore'))
+                w('\n')
             if logf:
-                logf.write(s + "\n")
+                logf.write(raw)
 
-            updates = parse_sentence(talker_sen, fields)
-            if updates:
-                merge_updates(state, updates)
+            parse_sentence(talker_sen, fields, state)
 
-            now = time.time()
+            if once:
+                continue
             if now - last_emit >= 1.0:
                 last_emit = now
-                if args.partial or (state.get('lat') is not None and state.get('lon') is not None and state.get('utc_time')):
-                    if args.format:
-                        # Custom format string output
-                        try:
-                            # Create a dict with safe defaults for missing values
-                            format_dict = {}
-                            for k, v in state.items():
-                                if k == 'gsv':
-                                    # Convert GSV dict to string representation
-                                    format_dict[k] = str(v)
-                                elif isinstance(v, float):
-                                    format_dict[k] = v
-                                else:
-                                    format_dict[k] = v
-                            # Use % formatting with the state dict
-                            print(args.format % format_dict, flush=True)
-                        except (KeyError, ValueError, TypeError) as e:
-                            print(f"Format error: {e}", file=sys.stderr)
-                    elif args.json:
-                        out = dict(state)  # shallow copy
-                        # reduce float verbosity and format gsv for readability
-                        for k in list(out.keys()):
-                            v = out[k]
-                            if k == 'gsv':
-                                # Flatten gsv to just {"GP": 7, "GL": 8} format
-                                out[k] = {sys: data.get('in_view', 0) for sys, data in v.items()}
-                            elif isinstance(v, float):
-                                out[k] = round(v, 6 if k in ('lat','lon') else 3)
-                        print(json.dumps(out, separators=(',',':'), ensure_ascii=False), flush=True)
-                    else:
-                        line = human_status(state)
-                        print(line, flush=True)
+                has_fix = state.get('lat') is not None and state.get('lon') is not None and state.get('utc_time')
+                if args.partial or has_fix:
+                    emit(state)
     except KeyboardInterrupt:
         print("\nInterrupted.")
     finally: